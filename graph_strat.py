@@ -1,27 +1,52 @@
+import bisect
 import functools
+import importlib
+import inspect
+import math
+import sys
+from array import array
+from collections import OrderedDict, abc
 from numbers import Integral
-from typing import Generator, Optional, Tuple, TypeVar, Union
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
 
 import hypothesis.strategies as st
 import networkx as nx
-from hypothesis_networkx import graph_builder
 
-__all__ = ["graphs"]
+__all__ = ["graphs", "DrawnGraph"]
 
 T = TypeVar("T")
 OptionalStrategy = Union[T, st.SearchStrategy[T]]
 
 
-@st.composite
 def graphs(
-    draw,
     min_nodes: int,
     max_nodes: Optional[int] = None,
     min_num_components: Optional[int] = None,
     max_num_components: Optional[int] = None,
     min_component_size: int = 1,
     max_component_size: Optional[int] = None,
-) -> st.SearchStrategy[nx.Graph]:
+    min_edges: Optional[int] = None,
+    max_edges: Optional[int] = None,
+    max_degree: Optional[int] = None,
+    output: str = "graph",
+    with_metadata: bool = False,
+    shuffle_labels: bool = False,
+) -> st.SearchStrategy[Any]:
     """Draws graphs whose number of nodes, number of connected components, and
     size of connected components are constrained.
 
@@ -54,9 +79,52 @@ def graphs(
         default value adapts according to the constraints of other parameters to permit
         the largest possible connected component.
 
+    min_edges : Optional[int]
+        The minimum number of edges permitted in a graph. Unconstrained by default.
+        This bounds the graph as a whole; the number of edges of each connected
+        component cannot be bounded individually.
+
+    max_edges : Optional[int]
+        The maximum number of edges permitted in a graph. Unconstrained by default.
+        Like ``min_edges``, this bounds the graph as a whole.
+
+    max_degree : Optional[int]
+        The maximum degree permitted for any node in a graph. Unconstrained by
+        default. A degree of less than two restricts the size of the connected
+        components accordingly. In conjunction with ``min_edges``, the check for
+        graphs that satisfy the constraints is conservative: each component is only
+        deemed to accommodate the number of edges that it is guaranteed to reach
+        irrespective of its spanning tree, which can fall short of the largest
+        number of edges that its degree bound permits. Hence some satisfiable
+        constraints are reported as unsatisfiable.
+
+    output : str, optional (default="graph")
+        The form in which each graph is drawn:
+            - ``"graph"``: an ``nx.Graph``
+            - ``"edgelist"``: a tuple of NumPy arrays: an (E, 2) integer array of
+              edges, and a length-N array that labels each node with the index of its
+              connected component. No ``nx.Graph`` is constructed. Requires NumPy.
+            - ``"csr"`` / ``"coo"``: the graph's symmetric (N, N) adjacency matrix, as
+              a ``scipy.sparse.csr_matrix`` / ``scipy.sparse.coo_matrix`` of
+              ``float64`` ones. The components form contiguous diagonal blocks. No
+              ``nx.Graph`` is constructed. Requires SciPy.
+
+    with_metadata : bool, optional (default=False)
+        If ``True``, each graph is drawn as a ``DrawnGraph``, which holds the graph
+        along with its partition into connected components, the range of nodes of each
+        component, and the component-label of each node.
+
+    shuffle_labels : bool, optional (default=False)
+        If ``True``, a single permutation of the nodes is drawn and applied to the
+        whole graph, so that components no longer occupy contiguous ranges of nodes.
+        The permutation shrinks towards the identity.
+
     Returns
     -------
     st.SearchStrategy[nx.Graph]
+    | st.SearchStrategy[Tuple[np.ndarray, np.ndarray]]
+    | st.SearchStrategy[scipy.sparse.spmatrix]
+    | st.SearchStrategy[DrawnGraph]
 
     Notes
     -----
@@ -65,111 +133,1752 @@ def graphs(
     It is recommended that you either constrain the number of connected components or
     their size, not both.
 
+    The number of nodes and the number of components are only ever drawn from the
+    feasible region that is permitted by the constraints; an ``InvalidArgument``
+    error is raised upon calling ``graphs`` if there is no such region.
+
+    Calls with identical arguments return the same strategy object.
+
     Values drawn from this strategy shrink towards a graph with:
         - fewer nodes
         - fewer connected components
         - an even distribution of nodes among its connected components
+        - fewer edges
 
-    Also note that the partition-generation process scales harshly with number of nodes:
-    it is inadvisable to draw graphs with more then tens of nodes."""
-    if not isinstance(min_nodes, Integral):
-        raise InvalidArgument("`min_nodes` must be an integer value")
+    Nodes are labelled 0, ..., N - 1, such that the i-th component (in order of
+    the drawn partition) occupies the contiguous range of nodes
+    ``range(offset_i, offset_i + size_i)``, where ``offset_i`` is the total size of
+    the preceding components. This holds for every ``output`` form, unless
+    ``shuffle_labels=True``; use ``with_metadata=True`` to obtain the offsets, along
+    with an O(1) mapping of each node to its component.
 
-    if not isinstance(min_component_size, Integral):
-        raise InvalidArgument("`min_component_size` must be an integer value")
+    When the number of edges is constrained, the total number of edges is drawn
+    first and is then allotted among the components in proportion to the number of
+    edges that each can accommodate beyond its spanning tree. In conjunction with
+    ``max_degree``, a component is only deemed to accommodate the number of edges
+    that it is guaranteed to reach irrespective of its spanning tree.
 
-    if (
-        min_num_components is not None
-        and min_nodes < min_num_components * min_component_size
-    ):
+    The partition of nodes among components is drawn by its index, thus the set of
+    all such partitions is never generated."""
+    arguments = dict(
+        min_nodes=min_nodes,
+        max_nodes=max_nodes,
+        min_num_components=min_num_components,
+        max_num_components=max_num_components,
+        min_component_size=min_component_size,
+        max_component_size=max_component_size,
+        min_edges=min_edges,
+        max_edges=max_edges,
+        max_degree=max_degree,
+        output=output,
+        with_metadata=with_metadata,
+        shuffle_labels=shuffle_labels,
+    )
+    try:
+        key = _interning_key(arguments)
+    except TypeError:
+        # unhashable arguments are never valid; let validation report them
+        return _build_graphs(**arguments)
+    return _interned_graphs(key)
+
+
+def _interning_key(arguments: Dict[str, Any]) -> Tuple[Tuple[str, type, Any], ...]:
+    """Returns a hashable key that identifies ``graphs`` arguments up to their integer
+    types, e.g. ``numpy.int64(3)`` and ``3`` are identified, but ``1`` and ``True``
+    are not. Raises ``TypeError`` for unhashable arguments."""
+    key = []
+    for name, value in arguments.items():
+        if isinstance(value, Integral) and not isinstance(value, bool):
+            value = int(value)
+        key.append((name, type(value), value))
+    hash(tuple(key))
+    return tuple(key)
+
+
+@functools.lru_cache(maxsize=256)
+def _interned_graphs(key: Tuple[Tuple[str, type, Any], ...]) -> st.SearchStrategy[Any]:
+    """Identical calls to ``graphs`` share a single strategy, along with its
+    precomputed feasibility tables."""
+    return _build_graphs(**{name: value for name, _, value in key})
+
+
+def _build_graphs(
+    min_nodes: int,
+    max_nodes: Optional[int],
+    min_num_components: Optional[int],
+    max_num_components: Optional[int],
+    min_component_size: int,
+    max_component_size: Optional[int],
+    min_edges: Optional[int],
+    max_edges: Optional[int],
+    max_degree: Optional[int],
+    output: str,
+    with_metadata: bool,
+    shuffle_labels: bool,
+) -> st.SearchStrategy[Any]:
+    arguments = dict(
+        min_nodes=min_nodes,
+        max_nodes=max_nodes,
+        min_num_components=min_num_components,
+        max_num_components=max_num_components,
+        min_component_size=min_component_size,
+        max_component_size=max_component_size,
+        min_edges=min_edges,
+        max_edges=max_edges,
+        max_degree=max_degree,
+        output=output,
+        with_metadata=with_metadata,
+        shuffle_labels=shuffle_labels,
+    )
+
+    for name, value in [
+        ("min_nodes", min_nodes),
+        ("min_component_size", min_component_size),
+    ]:
+        if not isinstance(value, Integral):
+            raise InvalidArgument(f"`{name}` must be an integer value")
+
+    for name, value in [
+        ("max_nodes", max_nodes),
+        ("min_num_components", min_num_components),
+        ("max_num_components", max_num_components),
+        ("max_component_size", max_component_size),
+    ]:
+        if value is not None and not isinstance(value, Integral):
+            raise InvalidArgument(f"`{name}` must be an integer value")
+
+    for name, value in [
+        ("min_component_size", min_component_size),
+        ("max_component_size", max_component_size),
+    ]:
+        if value is not None and value < 1:
+            raise InvalidArgument(f"`{name}` must be a positive integer value")
+
+    for name, value in [("min_edges", min_edges), ("max_edges", max_edges)]:
+        if value is not None and (not isinstance(value, Integral) or value < 0):
+            raise InvalidArgument(f"`{name}` must be a non-negative integer value")
+
+    if min_edges is not None and max_edges is not None and min_edges > max_edges:
+        raise InvalidArgument("`min_edges` must not exceed `max_edges`")
+
+    if not isinstance(with_metadata, bool):
+        raise InvalidArgument("`with_metadata` must be a boolean value")
+
+    if not isinstance(shuffle_labels, bool):
+        raise InvalidArgument("`shuffle_labels` must be a boolean value")
+
+    if output not in _OUTPUT_FORMATS:
+        raise InvalidArgument(
+            f"`output` must be one of {', '.join(map(repr, _OUTPUT_FORMATS))}, "
+            f"got {output!r}"
+        )
+
+    # a missing optional dependency is reported upon construction, not upon drawing
+    if output != "graph":
+        _import_optional("numpy", output)
+    if output in {"csr", "coo"}:
+        _import_optional("scipy.sparse", output)
+
+    if max_degree is not None:
+        if not isinstance(max_degree, Integral) or max_degree < 0:
+            raise InvalidArgument("`max_degree` must be a non-negative integer value")
+
+        if max_degree < 2:
+            # only components of up to `max_degree + 1` nodes can be connected
+            if min_component_size > max_degree + 1:
+                raise InvalidArgument(
+                    f"A connected component of size {min_component_size} cannot have "
+                    f"a maximum degree of {max_degree}"
+                )
+            max_component_size = min(
+                max_degree + 1,
+                max_degree + 1 if max_component_size is None else max_component_size,
+            )
+
+    if max_component_size is not None and max_component_size < min_component_size:
         raise InvalidArgument(
-            "The relationship:"
-            "\n\tmin_num_components * min_component_size <= min_nodes"
-            "\nmust hold."
+            "`max_component_size` must not be smaller than `min_component_size`"
         )
 
     if max_nodes is None:
         max_nodes = min_nodes + 10
 
-    num_nodes = draw(st.integers(min_nodes, max_nodes))
+    bounds = dict(
+        min_num_components=min_num_components,
+        max_num_components=max_num_components,
+        min_component_size=min_component_size,
+        max_component_size=max_component_size,
+        max_edges=max_edges,
+    )
+    # the extreme feasible numbers of nodes are found in closed form and, given
+    # `min_edges`, by a search over the numbers of components whose length is at
+    # most linear in `min_edges`; thus constructing the strategy does not scale with
+    # the range of nodes
+    lowest = _nearest_feasible_num_nodes(max(min_nodes, 1), round_up=True, **bounds)
+    highest = _nearest_feasible_num_nodes(max_nodes, round_up=False, **bounds)
 
-    if min_num_components is None:
-        if max_component_size is None:
-            min_num_components = 1
-        else:
-            min_num_components = max(num_nodes // max_component_size, 1)
+    if lowest is not None and highest is not None and lowest <= highest and min_edges:
+        lowest = _nearest_accommodating_num_nodes(
+            lowest,
+            highest,
+            round_up=True,
+            min_edges=min_edges,
+            max_degree=max_degree,
+            **bounds,
+        )
+        if lowest is not None:
+            highest = _nearest_accommodating_num_nodes(
+                lowest,
+                highest,
+                round_up=False,
+                min_edges=min_edges,
+                max_degree=max_degree,
+                **bounds,
+            )
+
+    if lowest is None or highest is None or lowest > highest:
+        # the capacity of bounded-degree components is underestimated
+        conservative = bool(min_edges) and max_degree is not None
+        raise InvalidArgument(
+            (
+                "No graphs could be found that satisfy:"
+                if conservative
+                else "There are no graphs that satisfy:"
+            )
+            + f"\n\tmin_nodes: {min_nodes}"
+            + f"\n\tmax_nodes: {max_nodes}"
+            + "".join(f"\n\t{k}: {v}" for k, v in bounds.items())
+            + f"\n\tmin_edges: {min_edges}"
+            + f"\n\tmax_degree: {max_degree}"
+            + (
+                "\nUnder `max_degree`, each component is only deemed to accommodate "
+                "the number of edges that it is guaranteed to reach, so `min_edges` "
+                "may be satisfiable nonetheless."
+                if conservative
+                else ""
+            )
+        )
+
+    return _GraphStrategy(
+        arguments,
+        num_nodes_strategy=st.integers(lowest, highest),
+        max_nodes=highest,
+        bounds=bounds,
+        # no component of a drawn graph can exceed `highest` nodes
+        max_component_size=(
+            highest if max_component_size is None else max_component_size
+        ),
+        min_edges=min_edges,
+        max_degree=max_degree,
+        output=output,
+        with_metadata=with_metadata,
+        shuffle_labels=shuffle_labels,
+    )
+
+
+def _num_components_bounds(
+    num_nodes: int,
+    *,
+    min_num_components: Optional[int],
+    max_num_components: Optional[int],
+    min_component_size: int,
+    max_component_size: Optional[int],
+    max_edges: Optional[int],
+) -> Tuple[int, int]:
+    """Returns the smallest and largest numbers of connected components that graphs
+    with `num_nodes` nodes may have; there are none if the former exceeds the latter.
 
-    if max_num_components is None:
-        max_num_components = num_nodes // min_component_size
+    k components can hold n nodes iff k * min_size <= n <= k * max_size, and a graph
+    with n nodes and k components has at least n - k edges."""
+    lowest = max(1, min_num_components or 1)
+    if max_component_size is not None:
+        lowest = max(lowest, -(-num_nodes // max_component_size))
+    if max_edges is not None:
+        lowest = max(lowest, num_nodes - max_edges)
 
-    num_components = draw(st.integers(min_num_components, max_num_components))
+    highest = num_nodes // min_component_size
+    if max_num_components is not None:
+        highest = min(highest, max_num_components)
+    return lowest, highest
 
-    partitions = st.sampled_from(
-        restricted_partitions(
-            num_items=num_nodes,
-            num_partitions=num_components,
-            min_partition_size=min_component_size,
-            max_partition_size=max_component_size,
+
+def _nearest_feasible_num_nodes(
+    num_nodes: int,
+    *,
+    round_up: bool,
+    min_num_components: Optional[int],
+    max_num_components: Optional[int],
+    min_component_size: int,
+    max_component_size: Optional[int],
+    max_edges: Optional[int],
+) -> Optional[int]:
+    """Returns the smallest number of nodes, no fewer than `num_nodes`, for which
+    `_num_components_bounds` is non-empty; or the largest, no greater than
+    `num_nodes`, if `round_up` is false. Returns ``None`` if there is no such number.
+
+    k components permit the numbers of nodes in
+    [k * min_size, min(k * max_size, k + max_edges)]; both endpoints grow with k, and
+    the interval is non-empty iff k * (min_size - 1) <= max_edges. Thus the nearest
+    feasible number of nodes is determined by the nearest admissible k."""
+    most = math.inf if max_num_components is None else max_num_components
+    if max_edges is not None and min_component_size > 1:
+        most = min(most, max_edges // (min_component_size - 1))
+
+    if round_up:
+        # the smallest k whose interval reaches `num_nodes`
+        k, _ = _num_components_bounds(
+            num_nodes,
+            min_num_components=min_num_components,
+            max_num_components=None,
+            min_component_size=min_component_size,
+            max_component_size=max_component_size,
+            max_edges=max_edges,
         )
+        return max(num_nodes, k * min_component_size) if k <= most else None
+
+    # the largest k whose interval starts at or below `num_nodes`
+    k = min(most, num_nodes // min_component_size)
+    if k < max(1, min_num_components or 1):
+        return None
+    largest = num_nodes
+    if max_component_size is not None:
+        largest = min(largest, k * max_component_size)
+    if max_edges is not None:
+        largest = min(largest, k + max_edges)
+    return largest
+
+
+@functools.lru_cache(maxsize=256)
+def _feasible_num_components(
+    num_nodes: int,
+    min_edges: Optional[int],
+    max_degree: Optional[int],
+    **bounds: Any,
+) -> Tuple[range, ...]:
+    """Returns the numbers of connected components for which there exist graphs with
+    `num_nodes` nodes that satisfy the constraints: the interval given by
+    `_num_components_bounds`, filtered by the number of edges that the most unbalanced
+    partition can accommodate, given `min_edges`.
+
+    The numbers are returned as ascending runs of consecutive numbers, thus their
+    storage does not scale with the size of the interval."""
+    lowest, highest = _num_components_bounds(num_nodes, **bounds)
+    # the spanning trees alone accommodate `min_edges` for fewer components
+    split = highest + 1
+    if min_edges:
+        split = min(max(lowest, num_nodes - min_edges + 1), highest + 1)
+
+    runs = []
+    start = lowest
+    for k in range(split, highest + 1):
+        if (
+            _max_num_edges(
+                num_nodes,
+                k,
+                bounds["min_component_size"],
+                bounds["max_component_size"],
+                max_degree,
+            )
+            < min_edges
+        ):
+            if start < k:
+                runs.append(range(start, k))
+            start = k + 1
+    if start <= highest:
+        runs.append(range(start, highest + 1))
+    return tuple(runs)
+
+
+@functools.lru_cache(maxsize=256)
+def _nearest_accommodating_num_nodes(
+    lowest: int,
+    highest: int,
+    *,
+    round_up: bool,
+    min_edges: int,
+    max_degree: Optional[int],
+    min_num_components: Optional[int],
+    max_num_components: Optional[int],
+    min_component_size: int,
+    max_component_size: Optional[int],
+    max_edges: Optional[int],
+) -> Optional[int]:
+    """Returns the smallest number of nodes in [lowest, highest] for which
+    `_feasible_num_components` is non-empty; or the largest, if `round_up` is false.
+    Returns ``None`` if there is no such number.
+
+    The nearest number of nodes is searched for per number of components k. A
+    component of s nodes holds at most (s - 1) * min(max_size, max_degree + 1) / 2
+    edges, thus a graph has at least 2 * min_edges / min(max_size, max_degree + 1)
+    more nodes than components; the search stops once no further k can improve upon
+    the nearest number of nodes that was found."""
+    min_size = min_component_size
+    max_size = highest if max_component_size is None else max_component_size
+    density = max_size if max_degree is None else min(max_size, max_degree + 1)
+    if density < 2:
+        return None
+    gap = -(-2 * min_edges // density)
+
+    largest_capacity = max(
+        _component_capacity(stop, max_degree)
+        for _, stop in _monotone_size_runs(min_size, max_size, max_degree)
     )
-    graph = nx.Graph()
+    fewest = max(1, min_num_components or 1, -(-min_edges // largest_capacity))
+    most = min(highest // min_size, highest - gap)
+    if max_num_components is not None:
+        most = min(most, max_num_components)
+    if max_edges is not None and min_size > 1:
+        most = min(most, max_edges // (min_size - 1))
 
-    for n_nodes in draw(partitions):
-        graph = nx.disjoint_union(
-            draw(
-                graph_builder(
-                    graph_type=nx.Graph,
-                    min_nodes=n_nodes,
-                    max_nodes=n_nodes,
-                    connected=True,
+    def node_range(k: int) -> Tuple[int, int]:
+        start = max(lowest, k * min_size, k + gap)
+        stop = min(highest, k * max_size)
+        if max_edges is not None:
+            stop = min(stop, k + max_edges)
+        return start, stop
+
+    nearest = None
+    if round_up:
+        first = max(fewest, -(-lowest // max_size))
+        if max_edges is not None:
+            first = max(first, lowest - max_edges)
+        for k in range(first, most + 1):
+            start, stop = node_range(k)
+            if nearest is not None and start >= nearest:
+                break
+            if start <= stop:
+                found = _nearest_num_nodes_with_capacity(
+                    k, start, stop, min_edges, min_size, max_size, max_degree, round_up
+                )
+                if found is not None and (nearest is None or found < nearest):
+                    nearest = found
+    else:
+        for k in range(most, fewest - 1, -1):
+            start, stop = node_range(k)
+            if stop < lowest or (nearest is not None and stop <= nearest):
+                break
+            if start <= stop:
+                found = _nearest_num_nodes_with_capacity(
+                    k, start, stop, min_edges, min_size, max_size, max_degree, round_up
                 )
-            ),
-            graph,
+                if found is not None and (nearest is None or found > nearest):
+                    nearest = found
+    return nearest
+
+
+def _nearest_num_nodes_with_capacity(
+    num_components: int,
+    lowest: int,
+    highest: int,
+    min_edges: int,
+    min_component_size: int,
+    max_component_size: int,
+    max_degree: Optional[int],
+    round_up: bool,
+) -> Optional[int]:
+    """Returns the smallest number of nodes in [lowest, highest] whose most unbalanced
+    partition into `num_components` components accommodates `min_edges` (see
+    `_max_num_edges`); or the largest, if `round_up` is false. Returns ``None`` if
+    there is no such number. Assumes that each of these numbers of nodes can be
+    partitioned into `num_components` components.
+
+    For k components and n = k * min_size + a * (max_size - min_size) + r, that
+    partition comprises a components of the maximum size, one of min_size + r nodes,
+    and the rest of the minimum size. Its capacity changes linearly with a, and with
+    r as `_component_capacity` does; thus, besides the rows of r at either end of the
+    range, only the nearest row whose largest capacity suffices is searched."""
+    k = num_components
+    width = max_component_size - min_component_size
+    smallest = _component_capacity(min_component_size, max_degree)
+    if not width:
+        return lowest if k * smallest >= min_edges else None
+    # the capacity gained with each component of the maximum size
+    gain = _component_capacity(max_component_size, max_degree) - smallest
+    # the largest capacity of a component of less than the maximum size
+    row_capacity = max(
+        _component_capacity(stop, max_degree)
+        for _, stop in _monotone_size_runs(
+            min_component_size, max_component_size - 1, max_degree
+        )
+    )
+    # the capacity that row a lacks, beyond that of its component of min_size + r
+    deficit = min_edges - (k - 1) * smallest
+    first_row, first_r = divmod(lowest - k * min_component_size, width)
+    last_row, last_r = divmod(highest - k * min_component_size, width)
+
+    if round_up:
+        rows = [first_row]
+        top = min(last_row, k - 1)
+        row = first_row + 1
+        if gain > 0:
+            row = max(row, -(-(deficit - row_capacity) // gain))
+        if row <= top:
+            rows.append(row)
+        if first_row < last_row == k:
+            rows.append(k)
+    else:
+        rows = [last_row]
+        row = min(last_row - 1, k - 1)
+        if gain < 0:
+            row = min(row, (row_capacity - deficit) // -gain)
+        if row >= first_row:
+            rows.append(row)
+
+    for row in rows:
+        # the row of k components of the maximum size comprises no other
+        start = min_component_size + (first_r if row == first_row else 0)
+        stop = min_component_size if row == k else max_component_size - 1
+        if row == last_row:
+            stop = min(stop, min_component_size + last_r)
+        size = _nearest_size_with_capacity(
+            deficit - row * gain, start, stop, max_degree, round_up=round_up
+        )
+        if size is not None:
+            return k * min_component_size + row * width + size - min_component_size
+    return None
+
+
+class _GraphStrategy(st.SearchStrategy):
+    """The strategy returned by ``graphs``.
+
+    All validation is performed by ``graphs``. The feasible numbers of components for
+    a drawn number of nodes are found in closed form, and are memoized when they must
+    be filtered by ``min_edges``, as is the nearest feasible number of nodes; thus
+    neither constructing nor drawing from the strategy scales with the range of
+    nodes."""
+
+    def __init__(
+        self,
+        arguments: Dict[str, Any],
+        *,
+        num_nodes_strategy: st.SearchStrategy[int],
+        max_nodes: int,
+        bounds: Dict[str, Any],
+        max_component_size: int,
+        min_edges: Optional[int],
+        max_degree: Optional[int],
+        output: str,
+        with_metadata: bool,
+        shuffle_labels: bool,
+    ):
+        super().__init__()
+        self.arguments = arguments
+        self.num_nodes_strategy = num_nodes_strategy
+        self.max_nodes = max_nodes
+        self.bounds = bounds
+        self.min_component_size = bounds["min_component_size"]
+        self.max_component_size = max_component_size
+        self.min_edges = min_edges
+        self.max_edges = bounds["max_edges"]
+        self.max_degree = max_degree
+        self.output = output
+        self.with_metadata = with_metadata
+        self.shuffle_labels = shuffle_labels
+        self._cached_repr: Optional[str] = None
+
+    def __repr__(self) -> str:
+        if self._cached_repr is None:
+            defaults = inspect.signature(graphs).parameters
+            self._cached_repr = "graphs({})".format(
+                ", ".join(
+                    f"{name}={value!r}"
+                    for name, value in self.arguments.items()
+                    if value != defaults[name].default
+                )
+            )
+        return self._cached_repr
+
+    def calc_is_empty(self, recur) -> bool:
+        # `graphs` refuses to construct a strategy whose feasible region is empty
+        return False
+
+    def calc_has_reusable_values(self, recur) -> bool:
+        # drawn graphs and arrays are mutable
+        return False
+
+    def do_draw(self, data) -> Any:
+        min_component_size = self.min_component_size
+        max_component_size = self.max_component_size
+        min_edges = self.min_edges
+        max_edges = self.max_edges
+        max_degree = self.max_degree
+
+        # the drawn number of nodes is rounded up to the nearest feasible one, which
+        # preserves the order in which the number of nodes shrinks; `max_nodes` is
+        # feasible, so the search ends there at the latest
+        num_nodes = data.draw(self.num_nodes_strategy)
+        if min_edges:
+            num_nodes = _nearest_accommodating_num_nodes(
+                num_nodes,
+                self.max_nodes,
+                round_up=True,
+                min_edges=min_edges,
+                max_degree=max_degree,
+                **self.bounds,
+            )
+        else:
+            num_nodes = _nearest_feasible_num_nodes(
+                num_nodes, round_up=True, **self.bounds
+            )
+        assert num_nodes is not None and num_nodes <= self.max_nodes
+        runs = _feasible_num_components(num_nodes, min_edges, max_degree, **self.bounds)
+
+        i = data.draw(st.integers(0, sum(map(len, runs)) - 1))
+        for run in runs:
+            if i < len(run):
+                num_components = run[i]
+                break
+            i -= len(run)
+
+        # the partition functions are called directly, as their arguments are
+        # known to be valid
+        num_partitions = _count_bounded_partitions(
+            num_nodes, num_components, min_component_size, max_component_size
+        )
+        partition = _unrank_partition(
+            data.draw(st.integers(0, num_partitions - 1)),
+            num_nodes,
+            num_components,
+            min_component_size,
+            max_component_size,
+        )
+
+        if (
+            min_edges
+            and sum(_component_capacity(s, max_degree) for s in partition) < min_edges
+        ):
+            # the most unbalanced partition is known to accommodate enough edges
+            partition = _unrank_partition(
+                num_partitions - 1,
+                num_nodes,
+                num_components,
+                min_component_size,
+                max_component_size,
+            )
+
+        if min_edges is None and max_edges is None:
+            component_strategies = [
+                _component_edges(s, max_degree=max_degree) for s in partition
+            ]
+        else:
+            num_tree_edges = num_nodes - num_components
+            capacities = [
+                _component_capacity(s, max_degree) - (s - 1) for s in partition
+            ]
+            most_extra = sum(capacities)
+            if max_edges is not None:
+                most_extra = min(most_extra, max_edges - num_tree_edges)
+            num_extra = data.draw(
+                st.integers(max(0, (min_edges or 0) - num_tree_edges), most_extra)
+            )
+            component_strategies = [
+                _component_edges(s, x, x, max_degree)
+                for s, x in zip(partition, _allot_edges(num_extra, capacities))
+            ]
+
+        component_edges = [data.draw(component) for component in component_strategies]
+
+        # shrinks towards the identity permutation
+        permutation = (
+            data.draw(st.permutations(range(num_nodes)))
+            if self.shuffle_labels
+            else None
         )
+
+        if self.output == "edgelist":
+            drawn = _edge_arrays(partition, component_edges, permutation)
+        elif self.output in {"csr", "coo"}:
+            drawn = _adjacency_matrix(
+                partition, component_edges, self.output, permutation
+            )
+        else:
+            drawn = _assemble_graph(partition, component_edges, permutation)
+
+        if self.with_metadata:
+            return DrawnGraph(drawn, partition, permutation)
+        return drawn
+
+
+def _assemble_graph(
+    partition: Sequence[int],
+    component_edges: Sequence[List[Tuple[int, int]]],
+    permutation: Optional[Sequence[int]] = None,
+) -> nx.Graph:
+    # The edges of all components are gathered, with each component's nodes offset
+    # past those of its predecessors, so that the graph is assembled in one pass
+    edges = []
+    offset = 0
+    for n_nodes, component in zip(partition, component_edges):
+        edges.extend((u + offset, v + offset) for u, v in component)
+        offset += n_nodes
+
+    if permutation is not None:
+        edges = [(permutation[u], permutation[v]) for u, v in edges]
+
+    graph = nx.Graph()
+    graph.add_nodes_from(range(offset))
+    graph.add_edges_from(edges)
     return graph
 
 
+class DrawnGraph:
+    """A graph drawn by ``graphs(..., with_metadata=True)``, along with the layout of
+    its connected components.
+
+    Attributes
+    ----------
+    graph : nx.Graph | Tuple[np.ndarray, np.ndarray] | scipy.sparse.spmatrix
+        The drawn graph, in the form specified by ``output``.
+
+    partition : Tuple[int, ...]
+        The size of each connected component.
+
+    offsets : Tuple[int, ...]
+        The first node of each connected component, prior to any relabelling.
+
+    component_ranges : Tuple[range, ...]
+        The nodes of each connected component, prior to any relabelling; i.e.
+        ``range(offsets[i], offsets[i] + partition[i])``.
+
+    permutation : Optional[Tuple[int, ...]]
+        The relabelling applied by ``shuffle_labels=True``: node ``i`` of the
+        contiguous layout is labelled ``permutation[i]`` in ``graph``. ``None`` if
+        the nodes were not relabelled.
+
+    labels : array.array
+        The index of the connected component of each node of ``graph``.
+
+    Examples
+    --------
+    >>> graph = nx.empty_graph(3)
+    >>> graph.add_edge(1, 2)
+    >>> drawn = DrawnGraph(graph, (1, 2))
+    >>> drawn.offsets
+    (0, 1)
+    >>> drawn.component_ranges
+    (range(0, 1), range(1, 3))
+    >>> drawn.labels.tolist()
+    [0, 1, 1]
+    >>> drawn.component_of(2)
+    1
+    """
+
+    __slots__ = (
+        "graph",
+        "partition",
+        "offsets",
+        "component_ranges",
+        "permutation",
+        "labels",
+    )
+
+    def __init__(
+        self,
+        graph: Any,
+        partition: Sequence[int],
+        permutation: Optional[Sequence[int]] = None,
+    ):
+        self.graph = graph
+        self.partition = tuple(partition)
+        offsets = []
+        offset = 0
+        for size in self.partition:
+            offsets.append(offset)
+            offset += size
+        self.offsets = tuple(offsets)
+        self.component_ranges = tuple(
+            range(start, start + size) for start, size in zip(offsets, self.partition)
+        )
+        self.permutation = None if permutation is None else tuple(permutation)
+        self.labels = array(_unsigned_typecode(len(self.partition)))
+        for i, size in enumerate(self.partition):
+            self.labels.extend([i] * size)
+        if self.permutation is not None:
+            shuffled_labels = array(self.labels.typecode, self.labels)
+            for node, label in zip(self.permutation, self.labels):
+                shuffled_labels[node] = label
+            self.labels = shuffled_labels
+
+    def component_of(self, node: int) -> int:
+        """Returns the index of the connected component that contains ``node``."""
+        return self.labels[node]
+
+    def component_nodes(self, index: int) -> Sequence[int]:
+        """Returns the nodes of ``graph`` that belong to the ``index``-th connected
+        component."""
+        nodes = self.component_ranges[index]
+        if self.permutation is None:
+            return nodes
+        return [self.permutation[n] for n in nodes]
+
+    def __repr__(self) -> str:
+        return f"DrawnGraph(graph={self.graph!r}, partition={self.partition!r})"
+
+
+_OUTPUT_FORMATS = ("graph", "edgelist", "csr", "coo")
+
+
+def _import_optional(module: str, output: str):
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        raise ImportError(
+            f"`graphs(..., output={output!r})` requires {module} to be installed"
+        ) from e
+
+
+def _edge_arrays(
+    partition: Sequence[int],
+    component_edges: Sequence[List[Tuple[int, int]]],
+    permutation: Optional[Sequence[int]] = None,
+) -> Tuple[Any, Any]:
+    """Returns an (E, 2) array of the components' edges, each component's nodes being
+    offset past those of its predecessors, along with the array of component-labels
+    for the nodes. Node i is relabelled as `permutation[i]`, if provided."""
+    np = _import_optional("numpy", "edgelist")
+    sizes = np.asarray(partition, dtype=np.int64)
+    offsets = np.cumsum(sizes) - sizes
+    blocks = [
+        np.asarray(edges, dtype=np.int64).reshape(-1, 2) + offset
+        for offset, edges in zip(offsets.tolist(), component_edges)
+    ]
+    edges = np.concatenate(blocks)
+    labels = np.repeat(np.arange(len(sizes), dtype=np.int64), sizes)
+    if permutation is not None:
+        permutation = np.asarray(permutation, dtype=np.int64)
+        edges = permutation[edges]
+        shuffled_labels = np.empty_like(labels)
+        shuffled_labels[permutation] = labels
+        labels = shuffled_labels
+    return edges, labels
+
+
+def _adjacency_matrix(
+    partition: Sequence[int],
+    component_edges: Sequence[List[Tuple[int, int]]],
+    output: str,
+    permutation: Optional[Sequence[int]] = None,
+) -> Any:
+    """Returns the symmetric adjacency matrix of the graph, in the sparse `output`
+    format. Absent `permutation`, its diagonal blocks are the components."""
+    np = _import_optional("numpy", output)
+    sparse = _import_optional("scipy.sparse", output)
+    edges, _ = _edge_arrays(partition, component_edges, permutation)
+    num_nodes = sum(partition)
+    rows = np.concatenate([edges[:, 0], edges[:, 1]])
+    cols = np.concatenate([edges[:, 1], edges[:, 0]])
+    matrix = sparse.coo_matrix(
+        (np.ones(len(rows)), (rows, cols)), shape=(num_nodes, num_nodes)
+    )
+    return matrix.tocsr() if output == "csr" else matrix
+
+
+def _num_pairs(num_nodes: int) -> int:
+    """The number of edges in a complete graph of `num_nodes` nodes."""
+    return num_nodes * (num_nodes - 1) // 2
+
+
+def _component_capacity(num_nodes: int, max_degree: Optional[int]) -> int:
+    """Returns the number of edges that a connected component of `num_nodes` nodes is
+    guaranteed to accommodate, without exceeding `max_degree`, irrespective of its
+    spanning tree.
+
+    Edges can be added between non-adjacent nodes that are both below the degree
+    bound, until those nodes S form a clique. The other nodes have degree
+    `max_degree`, while the nodes in S have a degree of at least |S| - 1, and, the
+    component being connected, at least one edge leaves S. The bound follows from
+    minimizing the resulting sum of degrees over 1 <= |S| <= max_degree; being
+    quadratic in |S|, the sum is minimized at |S| = (max_degree + 1) / 2.
+
+    The capacity grows with `num_nodes`, except that it can drop from
+    `num_nodes = max_degree + 1`, where the component is complete, to
+    `num_nodes = max_degree + 2`."""
+    if max_degree is None or max_degree >= num_nodes - 1:
+        return _num_pairs(num_nodes)
+    min_degree_sum = min(
+        (num_nodes - t) * max_degree + t * (t - 1) + 1
+        for t in {(max_degree + 1) // 2, (max_degree + 2) // 2}
+    )
+    return max(num_nodes - 1, -(-min_degree_sum // 2))
+
+
+def _monotone_size_runs(
+    min_size: int, max_size: int, max_degree: Optional[int]
+) -> List[Tuple[int, int]]:
+    """Splits the component sizes [min_size, max_size] into ascending runs, over each
+    of which `_component_capacity` is non-decreasing."""
+    if max_degree is not None and min_size <= max_degree + 1 < max_size:
+        return [(min_size, max_degree + 1), (max_degree + 2, max_size)]
+    return [(min_size, max_size)]
+
+
+def _nearest_size_with_capacity(
+    num_edges: int,
+    min_size: int,
+    max_size: int,
+    max_degree: Optional[int],
+    *,
+    round_up: bool,
+) -> Optional[int]:
+    """Returns the smallest component size in [min_size, max_size] whose capacity is
+    at least `num_edges`; or the largest, if `round_up` is false. Returns ``None`` if
+    there is no such size."""
+    runs = _monotone_size_runs(min_size, max_size, max_degree)
+    for start, stop in runs if round_up else reversed(runs):
+        if _component_capacity(stop, max_degree) < num_edges:
+            continue
+        if not round_up:
+            return stop
+        # bisect for the smallest sufficient size in the run
+        while start < stop:
+            mid = (start + stop) // 2
+            if _component_capacity(mid, max_degree) < num_edges:
+                start = mid + 1
+            else:
+                stop = mid
+        return stop
+    return None
+
+
+def _max_num_edges(
+    num_nodes: int,
+    num_components: int,
+    min_component_size: int,
+    max_component_size: Optional[int],
+    max_degree: Optional[int] = None,
+) -> int:
+    """Returns the number of edges that can be accommodated by the components of the
+    most unbalanced partition of nodes: as many components of the maximum size as
+    possible, with the remainder at the minimum size; -1 is returned if there is no
+    such partition.
+
+    Absent a degree bound, this is the largest number of edges that a graph can have
+    given its number of nodes and components, and the bounds on component-size."""
+    if max_component_size is None:
+        max_component_size = num_nodes
+    if not (
+        num_components * min_component_size
+        <= num_nodes
+        <= num_components * max_component_size
+    ):
+        return -1
+
+    surplus = num_nodes - num_components * min_component_size
+    width = max_component_size - min_component_size
+    if width == 0:
+        return num_components * _component_capacity(min_component_size, max_degree)
+
+    num_largest, remainder = divmod(surplus, width)
+    if num_largest == num_components:
+        return num_components * _component_capacity(max_component_size, max_degree)
+    return (
+        num_largest * _component_capacity(max_component_size, max_degree)
+        + _component_capacity(min_component_size + remainder, max_degree)
+        + (num_components - num_largest - 1)
+        * _component_capacity(min_component_size, max_degree)
+    )
+
+
+def _allot_edges(num_edges: int, capacities: Sequence[int]) -> List[int]:
+    """Allots `num_edges` among bins in proportion to their capacities; the
+    remainder of the proportional split is allotted one at a time in bin order.
+    Assumes that `num_edges` does not exceed the total capacity."""
+    total = sum(capacities)
+    if not total:
+        return [0] * len(capacities)
+
+    allotment = [num_edges * c // total for c in capacities]
+    remainder = num_edges - sum(allotment)
+    for i, capacity in enumerate(capacities):
+        if not remainder:
+            break
+        if allotment[i] < capacity:
+            allotment[i] += 1
+            remainder -= 1
+    return allotment
+
+
+def _unrank_pair(index: int) -> Tuple[int, int]:
+    """Maps `index` to the corresponding pair (u, v), with u < v, according to the
+    combinatorial number system; i.e. pairs are ordered colexicographically:
+    (0, 1), (0, 2), (1, 2), (0, 3), ..."""
+    v = (1 + math.isqrt(1 + 8 * index)) // 2
+    return index - v * (v - 1) // 2, v
+
+
+@functools.lru_cache(maxsize=128)
+def _component_edges(
+    num_nodes: int,
+    min_extra_edges: int = 0,
+    max_extra_edges: Optional[int] = None,
+    max_degree: Optional[int] = None,
+) -> st.SearchStrategy[List[Tuple[int, int]]]:
+    """Returns a strategy that draws the edges of a connected graph whose nodes are
+    0, ..., num_nodes - 1. Strategies are memoized by size, edge bounds, and degree
+    bound, thus repeated draws reuse the same strategy instances.
+
+    A spanning tree is drawn by attaching each node to one of its predecessors,
+    followed by [min_extra_edges, max_extra_edges] additional, distinct edges. This
+    shrinks towards a path graph.
+
+    Additional edges are drawn as indices into the pairs of nodes that are not
+    already joined by the tree, and are unranked into pairs; thus the cost of drawing
+    them does not depend on the number of possible pairs.
+
+    Given `max_degree`, the tree only attaches nodes to predecessors that are below
+    the bound, and drawn edges that would exceed it are skipped. Any shortfall from
+    `min_extra_edges` is then made up by joining the first available pairs of nodes;
+    this cannot fail so long as `min_extra_edges` is within the component's
+    guaranteed capacity (see `_component_capacity`)."""
+    # the number of pairs of nodes that are not joined by the spanning tree
+    capacity = _num_pairs(num_nodes) - max(num_nodes - 1, 0)
+    if max_extra_edges is None:
+        max_extra_edges = capacity
+
+    # when most of the available pairs are to be joined, draw those that are not
+    complement = max_degree is None and min_extra_edges > capacity // 2
+    if not capacity:
+        indices = st.just([])
+    elif complement:
+        indices = st.lists(
+            st.integers(0, capacity - 1),
+            unique=True,
+            min_size=capacity - max_extra_edges,
+            max_size=capacity - min_extra_edges,
+        )
+    else:
+        indices = st.lists(
+            st.integers(0, capacity - 1),
+            unique=True,
+            min_size=min_extra_edges if max_degree is None else 0,
+            max_size=max_extra_edges,
+        )
+
+    @st.composite
+    def component_edges(draw) -> List[Tuple[int, int]]:
+        if max_degree is None:
+            edges = [
+                (i - 1 - draw(st.integers(0, i - 1)), i) for i in range(1, num_nodes)
+            ]
+        else:
+            edges = _draw_bounded_tree(draw, num_nodes, max_degree)
+
+        # offsets[i] is the number of non-tree pairs that precede the i-th tree edge
+        offsets = [
+            rank - i
+            for i, rank in enumerate(sorted(_num_pairs(v) + u for u, v in edges))
+        ]
+        chosen = draw(indices)
+        if complement:
+            excluded = set(chosen)
+            chosen = [j for j in range(capacity) if j not in excluded]
+        # the j-th non-tree pair is preceded by each of the tree edges whose offset
+        # does not exceed j
+        extra_edges = (
+            _unrank_pair(j + bisect.bisect_right(offsets, j)) for j in chosen
+        )
+
+        if max_degree is None:
+            edges.extend(extra_edges)
+            return edges
+
+        degree = [0] * num_nodes
+        for u, v in edges:
+            degree[u] += 1
+            degree[v] += 1
+        num_tree_edges = len(edges)
+        for u, v in extra_edges:
+            if degree[u] < max_degree and degree[v] < max_degree:
+                edges.append((u, v))
+                degree[u] += 1
+                degree[v] += 1
+
+        if len(edges) - num_tree_edges < min_extra_edges:
+            present = set(edges)
+            for v in range(num_nodes):
+                for u in range(v):
+                    if len(edges) - num_tree_edges == min_extra_edges:
+                        return edges
+                    if (
+                        degree[u] < max_degree
+                        and degree[v] < max_degree
+                        and (u, v) not in present
+                    ):
+                        edges.append((u, v))
+                        degree[u] += 1
+                        degree[v] += 1
+        return edges
+
+    return component_edges()
+
+
+def _draw_bounded_tree(draw, num_nodes: int, max_degree: int) -> List[Tuple[int, int]]:
+    """Draws a spanning tree, whose nodes are 0, ..., num_nodes - 1, and whose
+    degree does not exceed `max_degree`. Each node is attached to one of its
+    predecessors that is below the bound; this shrinks towards a path graph."""
+    edges = []
+    degree = [0] * num_nodes
+    # the predecessors that can accept another edge, in order of attachment
+    open_nodes = [0]
+    for i in range(1, num_nodes):
+        position = len(open_nodes) - 1 - draw(st.integers(0, len(open_nodes) - 1))
+        parent = open_nodes[position]
+        edges.append((parent, i))
+        degree[parent] += 1
+        degree[i] += 1
+        if degree[parent] == max_degree:
+            del open_nodes[position]
+        if degree[i] < max_degree:
+            open_nodes.append(i)
+    return edges
+
+
 class InvalidArgument(ValueError):
     pass
 
+
 def _generate_partitions(
-    num_items: int, num_bins: int, min_partition_size: int = 1
+    num_items: int,
+    num_bins: int,
+    min_partition_size: int = 1,
+    max_partition_size: Optional[int] = None,
 ) -> Generator[Tuple[int, ...], None, None]:
+    """Yields the partitions of `num_items` into `num_bins` parts, whose sizes fall
+    within [min_partition_size, max_partition_size], in descending order: the most
+    balanced partition is yielded first.
+
+    Each part is bounded such that the remaining items can always be distributed
+    among the remaining bins, thus no branch of the search is a dead end.
+
+    The search is performed iteratively over a single buffer of part-sizes; a tuple
+    is only created when a partition is yielded."""
     if num_bins < 1:
         return
 
+    if max_partition_size is None:
+        max_partition_size = num_items
+
     if num_bins == 1:
-        if num_items >= min_partition_size:
+        if min_partition_size <= num_items <= max_partition_size:
             yield (num_items,)
         return
 
-    for i in range(min_partition_size, num_items + 1):
-        for result in _generate_partitions(num_items - i, num_bins - 1, i):
-            yield (i,) + result
+    last = num_bins - 1
+    parts = [0] * num_bins
+    # remaining[j] is the number of items to be distributed among parts[j:]
+    remaining = [0] * num_bins
+    remaining[0] = num_items
+    parts[0] = min(max_partition_size, num_items // num_bins) + 1
+    j = 0
+    while j >= 0:
+        parts[j] -= 1
+        if parts[j] < max(
+            parts[j - 1] if j else min_partition_size,
+            remaining[j] - (last - j) * max_partition_size,
+        ):
+            # all sizes for this part have been exhausted: backtrack
+            j -= 1
+            continue
+
+        if j == last - 1:
+            parts[last] = remaining[j] - parts[j]
+            yield tuple(parts)
+            continue
+
+        remaining[j + 1] = remaining[j] - parts[j]
+        j += 1
+        parts[j] = min(max_partition_size, remaining[j] // (num_bins - j)) + 1
+
+
+# Maps (n, k, m) -> the number of partitions of n into exactly k parts, each of
+# size at most m. Entries are only ever added for non-trivial, normalized keys.
+# The table is discarded before computing a new count once it holds more than
+# `_MAX_PARTITION_COUNTS` entries (roughly 20 MiB), so that its memory is bounded
+# between computations.
+_PARTITION_COUNTS: Dict[Tuple[int, int, int], int] = {}
+_MAX_PARTITION_COUNTS = 2**17
+
+
+def _lookup_partition_count(
+    n: int, k: int, m: int
+) -> Tuple[Tuple[int, int, int], Optional[int]]:
+    """Returns the normalized key for P(n, k, m) along with its value, if that value is
+    trivial or has already been computed; otherwise the value is ``None``."""
+    if k <= 0:
+        return (n, k, m), int(n == 0)
+
+    # no part can exceed n - (k - 1)
+    m = min(m, n - k + 1)
+    if m < 1 or n < k or n > k * m:
+        return (n, k, m), 0
+
+    if k == 1 or m == 1 or n == k or n == k * m:
+        return (n, k, m), 1
+
+    return (n, k, m), _PARTITION_COUNTS.get((n, k, m))
+
+
+def _num_partitions(n: int, k: int, m: int) -> int:
+    """Returns the number of partitions of `n` into exactly `k` parts, each of size
+    at most `m`.
+
+    Uses the recurrence P(n, k, m) = P(n - 1, k - 1, m) + P(n - k, k, m - 1): either
+    the smallest part is 1, or one can be subtracted from every part. The table is
+    filled with an explicit stack so that large inputs do not exhaust the
+    interpreter's recursion limit."""
+    key, value = _lookup_partition_count(n, k, m)
+    if value is not None:
+        return value
+
+    if len(_PARTITION_COUNTS) > _MAX_PARTITION_COUNTS:
+        _PARTITION_COUNTS.clear()
+
+    stack = [key]
+    while stack:
+        n, k, m = stack[-1]
+        total = 0
+        pending = False
+        for sub in ((n - 1, k - 1, m), (n - k, k, m - 1)):
+            sub_key, sub_value = _lookup_partition_count(*sub)
+            if sub_value is None:
+                stack.append(sub_key)
+                pending = True
+            else:
+                total += sub_value
+        if not pending:
+            _PARTITION_COUNTS[stack.pop()] = total
+    return _PARTITION_COUNTS[key]
+
+
+def _count_bounded_partitions(
+    num_items: int, num_bins: int, min_size: int, max_size: int
+) -> int:
+    """Returns the number of ways of partitioning `num_items` into `num_bins` parts
+    whose sizes fall within [min_size, max_size] (order is disregarded)."""
+    if num_bins == 0:
+        return int(num_items == 0)
+    if max_size < min_size:
+        return 0
+    # shifting every part down by (min_size - 1) maps onto partitions into
+    # parts of size [1, max_size - min_size + 1]
+    return _num_partitions(
+        num_items - num_bins * (min_size - 1), num_bins, max_size - min_size + 1
+    )
+
+
+def _unrank_partition(
+    index: int, num_items: int, num_bins: int, min_size: int, max_size: int
+) -> Tuple[int, ...]:
+    """Maps `index` to the corresponding partition in descending order.
+
+    Partitions are stored in ascending order of part-size; the sequence of partitions
+    is ordered lexicographically-descending. Thus the leading part is chosen from
+    largest to smallest, skipping over the number of partitions that are headed by
+    each of the larger candidates. Assumes that the arguments have been validated."""
+    out = []
+    remaining = num_items
+    for bins_left in range(num_bins, 0, -1):
+        # the leading part can be no larger than the average of the remaining
+        # items, and no smaller than what the trailing parts can make up for
+        low = max(min_size, remaining - (bins_left - 1) * max_size)
+        for size in range(min(max_size, remaining // bins_left), low - 1, -1):
+            num_tails = _count_bounded_partitions(
+                remaining - size, bins_left - 1, size, max_size
+            )
+            if index < num_tails:
+                break
+            index -= num_tails
+        out.append(size)
+        remaining -= size
+        min_size = size
+    return tuple(out)
+
+
+def _rank_partition(partition: Tuple[int, ...], num_items: int, max_size: int) -> int:
+    """The inverse of `_unrank_partition`. `partition` must be sorted in ascending
+    order and satisfy the constraints."""
+    index = 0
+    remaining = num_items
+    for bins_left, part in zip(range(len(partition), 0, -1), partition):
+        for size in range(min(max_size, remaining // bins_left), part, -1):
+            index += _count_bounded_partitions(
+                remaining - size, bins_left - 1, size, max_size
+            )
+        remaining -= part
+    return index
+
+
+def _canonical_partition_bounds(
+    num_items: int, num_bins: int, min_size: int, max_size: int
+) -> Tuple[int, int]:
+    """Tightens the part-size bounds to the smallest and largest part-sizes that
+    actually occur among the partitions satisfying them; thus equivalent bounds are
+    mapped to the same values. Assumes that the arguments have been validated."""
+    # the other parts can make up for at most (num_bins - 1) * max_size items
+    min_size = max(min_size, num_items - (num_bins - 1) * max_size)
+    # a single pass suffices: both of the new bounds are attained by partitions
+    # within the original bounds
+    max_size = min(max_size, num_items - (num_bins - 1) * min_size)
+    return min_size, max_size
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    nbytes: int
+    max_entries: Optional[int]
+    max_bytes: Optional[int]
+
+
+# typecodes of unsigned array-types, in order of increasing itemsize
+_UNSIGNED_TYPECODES = ("B", "H", "I", "L", "Q")
+
+
+def _unsigned_typecode(max_value: int) -> Optional[str]:
+    """Returns the typecode of the narrowest unsigned array-type that can hold
+    `max_value`, or `None` if there is no such type."""
+    return next(
+        (
+            code
+            for code in _UNSIGNED_TYPECODES
+            if max_value < 2 ** (8 * array(code).itemsize)
+        ),
+        None,
+    )
+
+
+class PartitionTable(abc.Sequence):
+    """An immutable sequence of equal-length partitions, which are packed into a
+    single array of unsigned integers. Each partition is returned as a tuple upon
+    access.
+
+    This is a drop-in replacement for a tuple of tuples: it can be indexed, sliced,
+    iterated over, sampled from via ``st.sampled_from``, and compares equal to the
+    tuple of tuples that it holds.
+
+    Parameters
+    ----------
+    partitions : Iterable[Sequence[int]]
+        The partitions to be stored, each of which has ``num_parts`` parts.
+
+    num_parts : int
+        The number of parts in each partition.
+
+    max_part_size : int
+        An upper bound on the part-sizes; this determines the array's item-size.
+
+    Examples
+    --------
+    >>> table = PartitionTable([(3, 3, 4), (2, 4, 4)], num_parts=3, max_part_size=4)
+    >>> table[1]
+    (2, 4, 4)
+    >>> table == ((3, 3, 4), (2, 4, 4))
+    True
+    """
+
+    __slots__ = ("_data", "_num_parts", "_len")
+
+    def __init__(
+        self,
+        partitions: Iterable[Sequence[int]],
+        *,
+        num_parts: int,
+        max_part_size: int,
+    ):
+        typecode = _unsigned_typecode(max_part_size)
+        if typecode is None:
+            raise InvalidArgument(
+                f"`max_part_size` is too large to be packed, got {max_part_size}"
+            )
+        data = array(typecode)
+        for partition in partitions:
+            data.extend(partition)
+        self._data = data
+        self._num_parts = num_parts
+        self._len = len(data) // num_parts if num_parts else 0
+
+    @property
+    def num_parts(self) -> int:
+        return self._num_parts
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes occupied by the table and its packed array."""
+        return sys.getsizeof(self) + sys.getsizeof(self._data)
+
+    def __len__(self) -> int:
+        return self._len
+
+    @overload
+    def __getitem__(self, index: int) -> Tuple[int, ...]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "PartitionTable": ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PartitionTable(
+                (self[i] for i in range(self._len)[index]),
+                num_parts=self._num_parts,
+                max_part_size=2 ** (8 * self._data.itemsize) - 1,
+            )
+        index = range(self._len)[index]  # normalizes negative indices; bounds-checks
+        start = index * self._num_parts
+        return tuple(self._data[start : start + self._num_parts])
+
+    def __iter__(self) -> Iterator[Tuple[int, ...]]:
+        data, k = self._data, self._num_parts
+        for start in range(0, self._len * k, k):
+            yield tuple(data[start : start + k])
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PartitionTable):
+            return (
+                self._len == other._len
+                and self._num_parts == other._num_parts
+                and self._data == other._data
+            )
+        if isinstance(other, tuple):
+            return len(other) == self._len and tuple(self) == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
+    def __repr__(self) -> str:
+        return f"PartitionTable({tuple(self)!r})"
+
+
+def _check_cache_bound(name: str, value: Optional[int]) -> None:
+    if value is not None and (not isinstance(value, Integral) or value < 0):
+        raise InvalidArgument(
+            f"`{name}` must be `None` or a non-negative integer, got {value}"
+        )
+
+
+class PartitionCache:
+    """A least-recently-used cache of the results of ``restricted_partitions``, which
+    is bounded both by its number of entries and by the estimated number of bytes
+    held by those entries.
+
+    Parameters
+    ----------
+    max_entries : Optional[int]
+        The largest number of results to be retained. ``None`` means unbounded.
+
+    max_bytes : Optional[int]
+        The largest (estimated) number of bytes to be retained across all results.
+        A result that exceeds this on its own is never cached. ``None`` means
+        unbounded.
+
+    Notes
+    -----
+    The cache used by ``restricted_partitions`` is available as
+    ``graph_strat.partition_cache``; use its ``resize`` method to tune it."""
+
+    def __init__(
+        self, max_entries: Optional[int] = 256, max_bytes: Optional[int] = 2**26
+    ):
+        _check_cache_bound("max_entries", max_entries)
+        _check_cache_bound("max_bytes", max_bytes)
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._data: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Returns the value stored under ``key``, or ``None`` if it is not cached."""
+        try:
+            value, _ = self._data[key]
+        except KeyError:
+            self._misses += 1
+            return None
+        self._data.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def put(self, key: Hashable, value: PartitionTable) -> None:
+        """Stores ``value`` under ``key``, evicting the least-recently used entries
+        as needed to respect the cache's bounds."""
+        if key in self._data:
+            _, nbytes = self._data.pop(key)
+            self._nbytes -= nbytes
+
+        nbytes = value.nbytes
+        if self._max_entries == 0 or (
+            self._max_bytes is not None and nbytes > self._max_bytes
+        ):
+            return
+
+        self._data[key] = (value, nbytes)
+        self._nbytes += nbytes
+        self._evict()
+
+    def clear(self) -> None:
+        """Removes all entries and resets the statistics."""
+        self._data.clear()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def resize(self, *, max_entries: Optional[int], max_bytes: Optional[int]) -> None:
+        """Sets new bounds for the cache, immediately evicting the least-recently
+        used entries to satisfy them."""
+        _check_cache_bound("max_entries", max_entries)
+        _check_cache_bound("max_bytes", max_bytes)
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._evict()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            entries=len(self._data),
+            nbytes=self._nbytes,
+            max_entries=self._max_entries,
+            max_bytes=self._max_bytes,
+        )
+
+    def _evict(self) -> None:
+        while self._data and (
+            (self._max_entries is not None and len(self._data) > self._max_entries)
+            or (self._max_bytes is not None and self._nbytes > self._max_bytes)
+        ):
+            _, (_, nbytes) = self._data.popitem(last=False)
+            self._nbytes -= nbytes
+            self._evictions += 1
+
+
+partition_cache = PartitionCache()
 
 
-@functools.lru_cache(maxsize=None)
 def restricted_partitions(
     *,
     num_items: int,
     num_partitions: int,
     min_partition_size: int = 1,
     max_partition_size: Optional[int] = None,
-) -> Tuple[Tuple[int, ...], ...]:
+) -> PartitionTable:
     """Returns all of the ways in which N can be partitioned K ways given a minimum
     partition size.
 
     Order is disregarded and the results are returned in descending order of
-    partition-size
+    partition-size. The partitions are packed into a ``PartitionTable``, which
+    behaves like a tuple of tuples.
+
+    Results are cached by ``partition_cache``, which is bounded by both its number of
+    entries and their estimated size in memory. See ``iter_restricted_partitions``
+    for an uncached alternative.
 
     Examples
     --------
     >>> restricted_partitions(num_items=10, num_partitions=3, min_partition_size=2)
-    ((3, 3, 4), (2, 4, 4), (2, 3, 5), (2, 2, 6))
+    PartitionTable(((3, 3, 4), (2, 4, 4), (2, 3, 5), (2, 2, 6)))
 
     >>> restricted_partitions(num_items=10, num_partitions=3, min_partition_size=2, max_partition_size=5)
-    ((3, 3, 4), (2, 4, 4), (2, 3, 5))
+    PartitionTable(((3, 3, 4), (2, 4, 4), (2, 3, 5)))
+    """
+    max_partition_size = _validate_partition_args(
+        num_items=num_items,
+        num_partitions=num_partitions,
+        min_partition_size=min_partition_size,
+        max_partition_size=max_partition_size,
+    )
+    min_partition_size, max_partition_size = _canonical_partition_bounds(
+        num_items, num_partitions, min_partition_size, max_partition_size
+    )
+
+    key = (num_items, num_partitions, min_partition_size, max_partition_size)
+    cached = partition_cache.get(key)
+    if cached is not None:
+        return cached
+
+    partitions = PartitionTable(
+        _generate_partitions(
+            num_items, num_partitions, min_partition_size, max_partition_size
+        ),
+        num_parts=num_partitions,
+        max_part_size=max_partition_size,
+    )
+    if not partitions:
+        raise AssertionError(
+            f"There are no partitions that satisfy:"
+            f"\nnum_items: {num_items}"
+            f"\nnum_partitions: {num_partitions}"
+            f"\nmin_partition_size: {min_partition_size}"
+            f"\nmax_partition_size: {max_partition_size}"
+        )
+    partition_cache.put(key, partitions)
+    return partitions
+
+
+def iter_restricted_partitions(
+    *,
+    num_items: int,
+    num_partitions: int,
+    min_partition_size: int = 1,
+    max_partition_size: Optional[int] = None,
+) -> Iterator[Tuple[int, ...]]:
+    """Lazily yields the partitions returned by ``restricted_partitions``, in the
+    same order.
+
+    Unlike ``restricted_partitions``, the results are not cached; this is suited to
+    consuming each partition exactly once. The arguments are validated when this
+    function is called, not upon the first iteration.
+
+    Examples
+    --------
+    >>> it = iter_restricted_partitions(num_items=10, num_partitions=3, min_partition_size=2)
+    >>> next(it)
+    (3, 3, 4)
+    >>> list(it)
+    [(2, 4, 4), (2, 3, 5), (2, 2, 6)]
+    """
+    max_partition_size = _validate_partition_args(
+        num_items=num_items,
+        num_partitions=num_partitions,
+        min_partition_size=min_partition_size,
+        max_partition_size=max_partition_size,
+    )
+    return _generate_partitions(
+        num_items, num_partitions, min_partition_size, max_partition_size
+    )
+
+
+def count_restricted_partitions(
+    *,
+    num_items: int,
+    num_partitions: int,
+    min_partition_size: int = 1,
+    max_partition_size: Optional[int] = None,
+) -> int:
+    """Returns the number of partitions that ``restricted_partitions`` would produce
+    for the same arguments, without generating any of them.
+
+    The count is computed via a memoized dynamic-programming table, thus it remains
+    cheap even for hundreds of items.
+
+    Examples
+    --------
+    >>> count_restricted_partitions(num_items=10, num_partitions=3, min_partition_size=2)
+    4
+
+    >>> count_restricted_partitions(num_items=200, num_partitions=20)
+    87438760128
+    """
+    max_partition_size = _validate_partition_args(
+        num_items=num_items,
+        num_partitions=num_partitions,
+        min_partition_size=min_partition_size,
+        max_partition_size=max_partition_size,
+    )
+    return _count_bounded_partitions(
+        num_items, num_partitions, min_partition_size, max_partition_size
+    )
+
+
+def unrank_restricted_partition(
+    index: int,
+    *,
+    num_items: int,
+    num_partitions: int,
+    min_partition_size: int = 1,
+    max_partition_size: Optional[int] = None,
+) -> Tuple[int, ...]:
+    """Returns the partition that resides at position ``index`` of the sequence returned
+    by ``restricted_partitions`` for the same arguments, without generating the
+    preceding partitions.
+
+    Index 0 corresponds to the most balanced partition.
+
+    Examples
+    --------
+    >>> unrank_restricted_partition(0, num_items=10, num_partitions=3, min_partition_size=2)
+    (3, 3, 4)
+
+    >>> unrank_restricted_partition(3, num_items=10, num_partitions=3, min_partition_size=2)
+    (2, 2, 6)
     """
+    max_partition_size = _validate_partition_args(
+        num_items=num_items,
+        num_partitions=num_partitions,
+        min_partition_size=min_partition_size,
+        max_partition_size=max_partition_size,
+    )
+    count = _count_bounded_partitions(
+        num_items, num_partitions, min_partition_size, max_partition_size
+    )
+    if not isinstance(index, Integral) or not 0 <= index < count:
+        raise InvalidArgument(
+            f"`index` must be an integer in [0, {count}), got {index}"
+        )
+    return _unrank_partition(
+        index, num_items, num_partitions, min_partition_size, max_partition_size
+    )
+
+
+def rank_restricted_partition(
+    partition: Sequence[int],
+    *,
+    min_partition_size: int = 1,
+    max_partition_size: Optional[int] = None,
+) -> int:
+    """Returns the position of ``partition`` within the sequence returned by
+    ``restricted_partitions``, without generating that sequence.
+
+    The number of items and number of partitions are inferred from ``partition``;
+    the order of its parts is disregarded. This is the inverse of
+    ``unrank_restricted_partition``.
+
+    Examples
+    --------
+    >>> rank_restricted_partition((3, 3, 4), min_partition_size=2)
+    0
+
+    >>> rank_restricted_partition((6, 2, 2), min_partition_size=2)
+    3
+    """
+    parts = tuple(sorted(partition))
+    if not parts or not all(isinstance(p, Integral) for p in parts):
+        raise InvalidArgument(
+            f"`partition` must be a non-empty sequence of integers, got {partition}"
+        )
+    num_items = sum(parts)
+    max_partition_size = _validate_partition_args(
+        num_items=num_items,
+        num_partitions=len(parts),
+        min_partition_size=min_partition_size,
+        max_partition_size=max_partition_size,
+    )
+    if not min_partition_size <= parts[0] or not parts[-1] <= max_partition_size:
+        raise InvalidArgument(
+            f"The partition {partition} does not satisfy:"
+            f"\n\tmin_partition_size: {min_partition_size}"
+            f"\n\tmax_partition_size: {max_partition_size}"
+        )
+    return _rank_partition(parts, num_items, max_partition_size)
+
+
+def _validate_partition_args(
+    *,
+    num_items: int,
+    num_partitions: int,
+    min_partition_size: int,
+    max_partition_size: Optional[int],
+) -> int:
+    """Validates the arguments shared by the restricted-partition functions and
+    returns the resolved value of ``max_partition_size``."""
     if not isinstance(num_items, Integral) or num_items < 1:
         raise InvalidArgument(
             f"`num_items` must be an integer greater than 1, got {num_items}"
@@ -216,19 +1925,4 @@ def restricted_partitions(
             f"\nThe smallest permissible value for `max_partition_size` is: "
             f"{num_items // num_partitions + bool(num_items % num_partitions)}"
         )
-
-    partitions = tuple(
-        x
-        for x in _generate_partitions(num_items, num_partitions, min_partition_size)
-        if max(x) <= max_partition_size
-    )
-    if not partitions:
-        raise AssertionError(
-            f"There are no partitions that satisfy:"
-            f"\nnum_items: {num_items}"
-            f"\nnum_partitions: {num_partitions}"
-            f"\nmin_partition_size: {min_partition_size}"
-            f"\nmax_partition_size: {max_partition_size}"
-        )
-    else:
-        return partitions[::-1]
+    return max_partition_size
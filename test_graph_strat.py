@@ -1,10 +1,11 @@
 import math
+import sys
 from typing import Dict, Union
 
 import hypothesis.strategies as st
 import networkx as nx
 import pytest
-from hypothesis import given
+from hypothesis import find, given, settings
 
 import graph_strat as cst
 
@@ -47,6 +48,29 @@ import graph_strat as cst
             max_num_components="min_nodes",
         ),
         dict(min_nodes=1, max_nodes=st.integers(1, 10)),
+        # vary number of edges
+        dict(min_nodes=st.integers(1, 20), max_edges=st.integers(0, 30)),
+        dict(min_nodes=st.integers(10, 20), min_edges=st.integers(0, 45)),
+        dict(
+            min_nodes=st.integers(10, 20),
+            min_edges=st.integers(0, 20),
+            max_edges=st.integers(20, 40),
+        ),
+        dict(
+            min_nodes=st.integers(5, 20),
+            max_nodes="min_nodes",
+            min_num_components=2,
+            min_edges="min_nodes",
+            max_edges="min_nodes",
+        ),
+        # vary maximum degree
+        dict(min_nodes=st.integers(1, 20), max_degree=st.integers(0, 4)),
+        dict(
+            min_nodes=st.integers(10, 20),
+            max_num_components=2,
+            max_degree=st.integers(2, 4),
+            min_edges="min_nodes",
+        ),
     ],
 )
 @given(data=st.data())
@@ -81,6 +105,9 @@ def test_fuzzing_with_default_args_for_graphs(
     max_num_components = kwargs.get("max_num_components", math.inf)
     min_component_size = kwargs.get("min_component_size", 1)
     max_component_size = kwargs.get("max_component_size", math.inf)
+    min_edges = kwargs.get("min_edges", 0)
+    max_edges = kwargs.get("max_edges", math.inf)
+    max_degree = kwargs.get("max_degree", math.inf)
 
     comps = nx.connected_components(graph)
     sizes = tuple(len(c) for c in comps)
@@ -91,3 +118,393 @@ def test_fuzzing_with_default_args_for_graphs(
     assert len(sizes) <= max_num_components
     assert min_component_size <= min(sizes)
     assert max(sizes) <= max_component_size
+    assert min_edges <= graph.number_of_edges() <= max_edges
+    assert max(d for _, d in graph.degree) <= max_degree
+
+
+@given(graph=cst.graphs(min_nodes=20, max_nodes=40, min_num_components=20))
+def test_nodes_are_labelled_by_contiguous_integers(graph: nx.Graph):
+    assert sorted(graph.nodes) == list(range(len(graph)))
+
+
+@given(
+    drawn=cst.graphs(
+        min_nodes=1, max_nodes=30, max_component_size=6, with_metadata=True
+    )
+)
+def test_components_occupy_contiguous_ranges_in_partition_order(drawn):
+    components = sorted(nx.connected_components(drawn.graph), key=min)
+    assert [set(r) for r in drawn.component_ranges] == components
+
+
+@settings(max_examples=20)
+@given(graph=cst.graphs(min_nodes=150, max_nodes=150, max_num_components=1))
+def test_large_single_component_is_connected(graph: nx.Graph):
+    assert len(graph) == 150
+    assert nx.is_connected(graph)
+
+
+def test_component_strategies_are_memoized_by_size():
+    assert cst._component_edges(5) is cst._component_edges(5)
+    assert cst._component_edges(5) is not cst._component_edges(6)
+
+
+def test_unrank_pair_enumerates_all_pairs_colexicographically():
+    n = 30
+    expected = [(u, v) for v in range(n) for u in range(v)]
+    assert [cst._unrank_pair(i) for i in range(len(expected))] == expected
+
+
+@settings(max_examples=10, deadline=None)
+@given(graph=cst.graphs(min_nodes=1000, max_nodes=1000, max_num_components=1))
+def test_large_sparse_components(graph: nx.Graph):
+    assert nx.is_connected(graph)
+
+
+@pytest.mark.parametrize("num_nodes", [1, 2, 3, 7, 12])
+@given(data=st.data())
+def test_component_edges_draws_exact_number_of_extra_edges(
+    num_nodes: int, data: st.DataObject
+):
+    # drawing more than half of the available pairs exercises drawing their complement
+    capacity = num_nodes * (num_nodes - 1) // 2 - (num_nodes - 1)
+    num_extra = data.draw(st.integers(0, capacity), label="num_extra")
+    edges = data.draw(cst._component_edges(num_nodes, num_extra, num_extra))
+    graph = nx.Graph(edges)
+    graph.add_nodes_from(range(num_nodes))
+    assert all(u < v for u, v in edges)
+    assert graph.number_of_edges() == len(edges) == num_nodes - 1 + num_extra
+    assert nx.is_connected(graph)
+
+
+@given(
+    capacities=st.lists(st.integers(0, 50), min_size=1),
+    data=st.data(),
+)
+def test_allot_edges_respects_capacities(capacities, data: st.DataObject):
+    num_edges = data.draw(st.integers(0, sum(capacities)), label="num_edges")
+    allotment = cst._allot_edges(num_edges, capacities)
+    assert sum(allotment) == num_edges
+    assert all(0 <= a <= c for a, c in zip(allotment, capacities))
+
+
+@pytest.mark.parametrize(
+    "kwargs", [dict(min_edges=-1), dict(max_edges=1.0), dict(min_edges=2, max_edges=1)]
+)
+def test_invalid_edge_bounds(kwargs):
+    with pytest.raises(ValueError):
+        cst.graphs(min_nodes=3, **kwargs)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(max_nodes=5.0),
+        dict(min_num_components="1"),
+        dict(max_num_components=2.5),
+        dict(max_component_size=None, min_component_size=1.0),
+        dict(max_component_size=[3]),
+        dict(min_component_size=0),
+        dict(max_component_size=0),
+        dict(max_component_size=-1),
+    ],
+)
+def test_non_integer_bounds_are_invalid_upon_construction(kwargs):
+    with pytest.raises(ValueError):
+        cst.graphs(min_nodes=3, **kwargs)
+
+
+@pytest.mark.parametrize("num_nodes", [1, 2, 3, 6, 11])
+@given(data=st.data())
+def test_bounded_degree_components_reach_their_capacity(
+    num_nodes: int, data: st.DataObject
+):
+    max_degree = data.draw(st.integers(min(num_nodes - 1, 2), 5), label="max_degree")
+    capacity = cst._component_capacity(num_nodes, max_degree) - (num_nodes - 1)
+    num_extra = data.draw(st.integers(0, capacity), label="num_extra")
+    edges = data.draw(cst._component_edges(num_nodes, num_extra, num_extra, max_degree))
+    graph = nx.Graph(edges)
+    graph.add_nodes_from(range(num_nodes))
+    assert graph.number_of_edges() == len(edges) == num_nodes - 1 + num_extra
+    assert nx.is_connected(graph)
+    assert max(d for _, d in graph.degree) <= max_degree
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(min_nodes=5, max_nodes=5, min_num_components=3, min_component_size=2),
+        dict(min_nodes=4, max_nodes=6, max_num_components=1, max_component_size=3),
+        dict(min_nodes=6, max_nodes=8, min_component_size=2, max_edges=2),
+        dict(min_nodes=3, max_nodes=4, max_degree=2, min_edges=5),
+        dict(min_nodes=1, max_nodes=4, min_component_size=2, max_component_size=1),
+        dict(min_nodes=1, max_nodes=9, min_component_size=3, max_component_size=2),
+    ],
+)
+def test_empty_feasible_region_is_reported_upon_construction(kwargs):
+    with pytest.raises(ValueError):
+        cst.graphs(**kwargs)
+
+
+@given(data=st.data())
+def test_draws_land_in_the_feasible_region(data: st.DataObject):
+    min_num_components = data.draw(st.integers(1, 4), label="min_num_components")
+    min_component_size = data.draw(st.integers(1, 4), label="min_component_size")
+    graph = data.draw(
+        cst.graphs(
+            min_nodes=1,
+            max_nodes=20,
+            min_num_components=min_num_components,
+            min_component_size=min_component_size,
+            max_component_size=min_component_size + 1,
+        )
+    )
+    sizes = [len(c) for c in nx.connected_components(graph)]
+    assert len(sizes) >= min_num_components
+    assert all(min_component_size <= s <= min_component_size + 1 for s in sizes)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(),
+        dict(min_edges=10),
+        dict(min_component_size=3, max_edges=10**6),
+        dict(max_component_size=2, min_edges=20000),
+        dict(max_component_size=7, max_degree=5, min_edges=20000),
+    ],
+)
+def test_construction_does_not_scale_with_the_range_of_nodes(kwargs):
+    # tabulating every number of nodes would exhaust the test's time and memory
+    cst.graphs(min_nodes=1, max_nodes=10**9, **kwargs)
+
+
+@given(data=st.data())
+def test_nearest_accommodating_num_nodes_agrees_with_a_scan(data: st.DataObject):
+    min_component_size = data.draw(st.integers(1, 4), label="min_component_size")
+    bounds = dict(
+        min_num_components=data.draw(st.none() | st.integers(1, 4)),
+        max_num_components=data.draw(st.none() | st.integers(1, 8)),
+        min_component_size=min_component_size,
+        max_component_size=data.draw(
+            st.none() | st.integers(min_component_size, min_component_size + 6)
+        ),
+        max_edges=data.draw(st.none() | st.integers(0, 40)),
+    )
+    max_degree = data.draw(st.none() | st.integers(2, 7), label="max_degree")
+    min_edges = data.draw(st.integers(1, 60), label="min_edges")
+    lowest = data.draw(st.integers(1, 30), label="lowest")
+    highest = data.draw(st.integers(lowest, 45), label="highest")
+
+    feasible = [
+        n
+        for n in range(lowest, highest + 1)
+        if cst._feasible_num_components(n, min_edges, max_degree, **bounds)
+    ]
+    for round_up, expected in [(True, min), (False, max)]:
+        assert cst._nearest_accommodating_num_nodes(
+            lowest,
+            highest,
+            round_up=round_up,
+            min_edges=min_edges,
+            max_degree=max_degree,
+            **bounds,
+        ) == (expected(feasible) if feasible else None)
+
+
+def test_min_edges_check_is_reported_as_conservative_under_max_degree():
+    # K5 less three edges has a maximum degree of 3, but is not found
+    with pytest.raises(ValueError, match="may be satisfiable nonetheless"):
+        cst.graphs(
+            min_nodes=5, max_nodes=5, max_num_components=1, max_degree=3, min_edges=7
+        )
+
+
+def test_max_degree_below_min_component_size_is_invalid():
+    with pytest.raises(ValueError):
+        cst.graphs(min_nodes=3, min_component_size=3, max_degree=1)
+
+
+@given(
+    arrays=cst.graphs(
+        min_nodes=1, max_nodes=30, max_component_size=6, output="edgelist"
+    )
+)
+def test_edgelist_output(arrays):
+    np = pytest.importorskip("numpy")
+    edges, labels = arrays
+    assert isinstance(edges, np.ndarray) and isinstance(labels, np.ndarray)
+    assert edges.ndim == 2 and edges.shape[1] == 2
+    assert np.issubdtype(edges.dtype, np.integer)
+    assert np.all(np.diff(labels) >= 0)
+    assert np.all(labels[edges[:, 0]] == labels[edges[:, 1]])
+
+    graph = nx.Graph(edges.tolist())
+    graph.add_nodes_from(range(len(labels)))
+    assert graph.number_of_edges() == len(edges)
+    components = sorted(map(sorted, nx.connected_components(graph)))
+    expected = sorted(np.flatnonzero(labels == i).tolist() for i in set(labels))
+    assert components == expected
+    assert max(map(len, components)) <= 6
+
+
+def test_invalid_output():
+    with pytest.raises(ValueError):
+        cst.graphs(min_nodes=1, output="adjacency")
+
+
+@pytest.mark.parametrize(
+    ("output", "missing"),
+    [("edgelist", "numpy"), ("csr", "scipy.sparse"), ("coo", "numpy")],
+)
+def test_missing_optional_dependency_is_reported_upon_construction(
+    output: str, missing: str, monkeypatch
+):
+    cst._interned_graphs.cache_clear()
+    monkeypatch.setitem(sys.modules, missing, None)
+    with pytest.raises(ImportError, match=missing):
+        cst.graphs(min_nodes=1, output=output)
+
+
+@pytest.mark.parametrize("output", ["csr", "coo"])
+@settings(deadline=None)  # the first example pays for importing SciPy
+@given(data=st.data())
+def test_sparse_adjacency_output(output: str, data: st.DataObject):
+    sparse = pytest.importorskip("scipy.sparse")
+    matrix = data.draw(
+        cst.graphs(min_nodes=1, max_nodes=30, max_component_size=6, output=output)
+    )
+    assert matrix.format == output
+    dense = matrix.toarray()
+    assert dense.shape[0] == dense.shape[1]
+    assert (dense == dense.T).all()
+    assert set(dense.ravel().tolist()) <= {0.0, 1.0}
+    assert not dense.diagonal().any()
+
+    num_components, labels = sparse.csgraph.connected_components(matrix)
+    assert (labels[1:] >= labels[:-1]).all()  # components are contiguous blocks
+    assert max(labels.tolist().count(i) for i in range(num_components)) <= 6
+
+
+@pytest.mark.parametrize("output", ["graph", "edgelist"])
+@given(data=st.data())
+def test_drawn_graph_metadata(output: str, data: st.DataObject):
+    drawn = data.draw(
+        cst.graphs(
+            min_nodes=1,
+            max_nodes=30,
+            max_component_size=6,
+            output=output,
+            with_metadata=True,
+        )
+    )
+    assert isinstance(drawn, cst.DrawnGraph)
+    assert not hasattr(drawn, "__dict__")
+    if output == "graph":
+        graph = drawn.graph
+    else:
+        edges, _ = drawn.graph
+        graph = nx.Graph(edges.tolist())
+        graph.add_nodes_from(range(len(drawn.labels)))
+
+    assert sorted(map(sorted, nx.connected_components(graph))) == sorted(
+        map(list, drawn.component_ranges)
+    )
+    assert tuple(map(len, drawn.component_ranges)) == drawn.partition
+    assert drawn.offsets == tuple(r.start for r in drawn.component_ranges)
+    assert all(
+        drawn.component_of(n) == i
+        for i, nodes in enumerate(drawn.component_ranges)
+        for n in nodes
+    )
+    assert all(
+        drawn.labels[n] == i
+        for i, nodes in enumerate(drawn.component_ranges)
+        for n in nodes
+    )
+
+
+def test_invalid_with_metadata():
+    with pytest.raises(ValueError):
+        cst.graphs(min_nodes=1, with_metadata=1)
+
+
+@pytest.mark.parametrize("output", ["graph", "edgelist"])
+@given(data=st.data())
+def test_shuffled_labels(output: str, data: st.DataObject):
+    drawn = data.draw(
+        cst.graphs(
+            min_nodes=1,
+            max_nodes=20,
+            max_component_size=5,
+            output=output,
+            with_metadata=True,
+            shuffle_labels=True,
+        )
+    )
+    if output == "graph":
+        graph = drawn.graph
+    else:
+        edges, labels = drawn.graph
+        assert labels.tolist() == drawn.labels.tolist()
+        graph = nx.Graph(edges.tolist())
+        graph.add_nodes_from(range(len(labels)))
+
+    assert sorted(drawn.permutation) == list(range(len(graph)))
+    assert sorted(graph.nodes) == list(range(len(graph)))
+    components = sorted(map(sorted, nx.connected_components(graph)))
+    assert components == sorted(
+        sorted(drawn.component_nodes(i)) for i in range(len(drawn.partition))
+    )
+    assert all(
+        drawn.component_of(n) == i
+        for i in range(len(drawn.partition))
+        for n in drawn.component_nodes(i)
+    )
+
+
+def test_shuffled_labels_shrink_to_identity():
+    drawn = find(
+        cst.graphs(min_nodes=5, max_nodes=5, shuffle_labels=True, with_metadata=True),
+        lambda _: True,
+    )
+    assert drawn.permutation == tuple(range(5))
+
+
+def test_graph_strategy_repr_lists_given_arguments():
+    strategy = cst.graphs(3, max_degree=2, output="edgelist")
+    assert repr(strategy) == "graphs(min_nodes=3, max_degree=2, output='edgelist')"
+    assert repr(strategy) is repr(strategy)
+    assert not strategy.is_empty
+
+
+@settings(max_examples=20)
+@given(graph_list=st.lists(cst.graphs(min_nodes=1, max_nodes=8), max_size=3))
+def test_graph_strategy_nests_in_other_strategies(graph_list):
+    assert all(1 <= len(graph) <= 8 for graph in graph_list)
+
+
+def test_drawing_does_not_revalidate_partition_arguments(monkeypatch):
+    strategy = cst.graphs(min_nodes=5, max_nodes=30, min_edges=12, max_component_size=8)
+
+    def fail(**kwargs):
+        raise AssertionError("partition arguments were validated during a draw")
+
+    monkeypatch.setattr(cst, "_validate_partition_args", fail)
+    find(strategy, lambda graph: len(graph) > 20)
+
+
+def test_identical_arguments_share_a_strategy():
+    strategy = cst.graphs(4, max_degree=3)
+    assert cst.graphs(min_nodes=4, max_degree=3) is strategy
+    assert cst.graphs(4, max_degree=3, shuffle_labels=True) is not strategy
+    assert cst.graphs(min_nodes=4, max_nodes=6) is not cst.graphs(4, max_nodes=7)
+
+
+def test_interning_does_not_bypass_validation():
+    cst.graphs(min_nodes=2, with_metadata=True)
+    with pytest.raises(ValueError):
+        cst.graphs(min_nodes=2, with_metadata=1)
+    cst.graphs(min_nodes=2, max_nodes=5)
+    with pytest.raises(ValueError):
+        cst.graphs(min_nodes=2, max_nodes=5.0)
@@ -1,4 +1,5 @@
 import math
+import sys
 from typing import Any, Dict, Tuple, Type, Union
 
 import hypothesis.strategies as st
@@ -27,6 +28,37 @@ def partitions(n, k=1):
             yield (i,) + p
 
 
+@st.composite
+def partition_args(draw) -> Dict[str, Any]:
+    """Draws satisfiable keyword arguments for the restricted-partition functions."""
+    num_items = draw(st.integers(1, 20), label="num_items")
+    num_partitions = draw(st.integers(1, num_items), label="num_partitions")
+    min_partition_size = draw(
+        st.integers(1, num_items // num_partitions), label="min_partition_size"
+    )
+    smallest_max = num_items // num_partitions + bool(num_items % num_partitions)
+    max_partition_size = draw(
+        st.none() | st.integers(min_value=smallest_max), label="max_partition_size"
+    )
+    return dict(
+        num_items=num_items,
+        num_partitions=num_partitions,
+        min_partition_size=min_partition_size,
+        max_partition_size=max_partition_size,
+    )
+
+
+# (num_items, num_partitions, min_partition_size)
+INVALID_PARTITION_ARGS = [
+    (0, 1, 1),
+    (1, 0, 1),
+    (1, 1, 0),
+    (1, 1, 2),
+    (1, 2, 1),  # unsatisfiable
+    (3, 3, 2),  # unsatisfiable
+]
+
+
 @given(num_items=st.integers(1, 20), data=st.data())
 def test_restricted_partition(num_items: int, data: st.DataObject):
     """Compare restricted partitions against exhaustive partitions that were filtered."""
@@ -104,3 +136,250 @@ def test_fuzz_partitions(
     ), out
     assert out == tuple(sorted(out)[::-1]), "partitions are not in descending order"
 
+
+@given(kwargs=partition_args())
+def test_count_matches_enumeration(kwargs: Dict[str, Any]):
+    assert cst.count_restricted_partitions(**kwargs) == len(
+        cst.restricted_partitions(**kwargs)
+    )
+
+
+@pytest.mark.parametrize(
+    ("n", "expected"), [(1, 1), (10, 42), (100, 190569292), (300, 9253082936723602)]
+)
+def test_count_sums_to_partition_numbers(n: int, expected: int):
+    assert (
+        sum(
+            cst.count_restricted_partitions(num_items=n, num_partitions=k)
+            for k in range(1, n + 1)
+        )
+        == expected
+    )
+
+
+@pytest.mark.parametrize(("n", "k", "l"), INVALID_PARTITION_ARGS)
+def test_count_validates_input_values(n, k, l):
+    with pytest.raises(ValueError):
+        cst.count_restricted_partitions(
+            num_items=n, num_partitions=k, min_partition_size=l
+        )
+
+
+@given(kwargs=partition_args())
+def test_unrank_matches_enumeration(kwargs: Dict[str, Any]):
+    expected = cst.restricted_partitions(**kwargs)
+    assert tuple(
+        cst.unrank_restricted_partition(i, **kwargs) for i in range(len(expected))
+    ) == tuple(expected)
+
+
+@pytest.mark.parametrize("index", [-1, 4, 1.0, None])
+def test_unrank_validates_index(index):
+    with pytest.raises(ValueError):
+        cst.unrank_restricted_partition(
+            index, num_items=10, num_partitions=3, min_partition_size=2
+        )
+
+
+def test_unrank_scales_to_hundreds_of_items():
+    kwargs = dict(num_items=500, num_partitions=40, min_partition_size=3)
+    count = cst.count_restricted_partitions(**kwargs)
+    assert cst.unrank_restricted_partition(0, **kwargs) == (12,) * 20 + (13,) * 20
+    last = cst.unrank_restricted_partition(count - 1, **kwargs)
+    assert last == (3,) * 39 + (500 - 3 * 39,)
+
+
+@given(kwargs=partition_args(), data=st.data())
+def test_rank_inverts_unrank(kwargs: Dict[str, Any], data: st.DataObject):
+    bounds = dict(
+        min_partition_size=kwargs["min_partition_size"],
+        max_partition_size=kwargs["max_partition_size"],
+    )
+    partitions = cst.restricted_partitions(**kwargs)
+    index = data.draw(st.integers(0, len(partitions) - 1), label="index")
+    shuffled = data.draw(st.permutations(partitions[index]), label="partition")
+    assert cst.rank_restricted_partition(shuffled, **bounds) == index
+
+
+@pytest.mark.parametrize(
+    ("partition", "min_size", "max_size"),
+    [((), 1, None), ((1, 2.0), 1, None), ((1, 3), 2, None), ((1, 3), 1, 2)],
+)
+def test_rank_validates_partition(partition, min_size, max_size):
+    with pytest.raises(ValueError):
+        cst.rank_restricted_partition(
+            partition, min_partition_size=min_size, max_partition_size=max_size
+        )
+
+
+def test_tight_max_partition_size_is_pruned_during_generation():
+    # without pruning this would first generate every partition of 120 into 12 parts
+    assert cst.restricted_partitions(
+        num_items=120, num_partitions=12, max_partition_size=10
+    ) == ((10,) * 12,)
+
+
+def test_many_partitions_do_not_exhaust_recursion_limit():
+    assert cst.restricted_partitions(num_items=2001, num_partitions=2000) == (
+        (1,) * 1999 + (2,),
+    )
+
+
+def test_partition_count_table_is_discarded_once_it_exceeds_its_bound(monkeypatch):
+    monkeypatch.setattr(cst, "_MAX_PARTITION_COUNTS", 100)
+    monkeypatch.setattr(cst, "_PARTITION_COUNTS", {})
+    cst.count_restricted_partitions(num_items=400, num_partitions=7)
+    fresh_size = len(cst._PARTITION_COUNTS)
+
+    cst._PARTITION_COUNTS.clear()
+    cst.count_restricted_partitions(num_items=300, num_partitions=30)
+    assert len(cst._PARTITION_COUNTS) > 100
+    cst.count_restricted_partitions(num_items=400, num_partitions=7)
+    assert len(cst._PARTITION_COUNTS) == fresh_size
+
+
+@given(kwargs=partition_args())
+def test_iter_matches_restricted_partitions(kwargs: Dict[str, Any]):
+    assert tuple(cst.iter_restricted_partitions(**kwargs)) == tuple(
+        cst.restricted_partitions(**kwargs)
+    )
+
+
+@pytest.mark.parametrize(("n", "k", "l"), INVALID_PARTITION_ARGS)
+def test_iter_validates_eagerly(n, k, l):
+    with pytest.raises(ValueError):
+        cst.iter_restricted_partitions(
+            num_items=n, num_partitions=k, min_partition_size=l
+        )
+
+
+def test_restricted_partitions_uses_partition_cache():
+    cst.partition_cache.clear()
+    kwargs = dict(num_items=12, num_partitions=3, min_partition_size=2)
+    first = cst.restricted_partitions(**kwargs)
+    assert cst.restricted_partitions(**kwargs) is first
+    stats = cst.partition_cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+    assert stats.nbytes > 0
+
+
+def _table(*partitions):
+    return cst.PartitionTable(
+        partitions,
+        num_parts=len(partitions[0]),
+        max_part_size=max(map(max, partitions)),
+    )
+
+
+def test_partition_cache_evicts_least_recently_used_entry():
+    cache = cst.PartitionCache(max_entries=2, max_bytes=None)
+    a, b, c = _table((1,)), _table((2,)), _table((3,))
+    cache.put("a", a)
+    cache.put("b", b)
+    assert cache.get("a") is a
+    cache.put("c", c)
+    assert cache.get("b") is None
+    assert cache.get("a") is a
+    assert cache.get("c") is c
+    assert cache.stats().evictions == 1
+
+
+def test_partition_cache_respects_byte_budget():
+    big = cst.restricted_partitions(num_items=30, num_partitions=5)
+    small = _table((1, 1))
+    nbytes = big.nbytes
+
+    cache = cst.PartitionCache(max_entries=None, max_bytes=nbytes - 1)
+    cache.put("big", big)
+    assert len(cache) == 0
+
+    cache.resize(max_entries=None, max_bytes=nbytes)
+    cache.put("small", small)
+    cache.put("big", big)
+    assert cache.get("small") is None
+    assert cache.stats().nbytes == nbytes <= cache.stats().max_bytes
+
+    cache.resize(max_entries=0, max_bytes=None)
+    assert len(cache) == 0
+    assert cache.stats().nbytes == 0
+
+
+def test_partition_cache_clear_resets_stats():
+    cache = cst.PartitionCache()
+    cache.put("a", _table((1,)))
+    cache.get("a")
+    cache.get("b")
+    cache.clear()
+    assert cache.stats() == cst.CacheStats(0, 0, 0, 0, 0, 256, 2**26)
+
+
+@pytest.mark.parametrize("bound", [-1, 1.5, "1"])
+def test_partition_cache_validates_bounds(bound):
+    with pytest.raises(ValueError):
+        cst.PartitionCache(max_entries=bound)
+    with pytest.raises(ValueError):
+        cst.PartitionCache().resize(max_entries=None, max_bytes=bound)
+
+
+@pytest.mark.parametrize(
+    "bounds",
+    [
+        dict(max_partition_size=8),  # the default cap
+        dict(max_partition_size=100),  # exceeds the default cap
+        dict(min_partition_size=1, max_partition_size=None),
+    ],
+)
+def test_equivalent_calls_share_cache_entry(bounds):
+    cst.partition_cache.clear()
+    first = cst.restricted_partitions(num_items=10, num_partitions=3)
+    assert cst.restricted_partitions(num_items=10, num_partitions=3, **bounds) is first
+    assert len(cst.partition_cache) == 1
+
+
+def test_min_size_below_effective_floor_shares_cache_entry():
+    cst.partition_cache.clear()
+    # with parts no larger than 4, the smallest part is at least 10 - 2 * 4 = 2
+    first = cst.restricted_partitions(
+        num_items=10, num_partitions=3, min_partition_size=2, max_partition_size=4
+    )
+    second = cst.restricted_partitions(
+        num_items=10, num_partitions=3, min_partition_size=1, max_partition_size=4
+    )
+    assert first is second
+    assert cst.partition_cache.stats().entries == 1
+
+
+def test_partition_table_behaves_like_tuple_of_tuples():
+    expected = ((3, 3, 4), (2, 4, 4), (2, 3, 5), (2, 2, 6))
+    table = cst.restricted_partitions(
+        num_items=10, num_partitions=3, min_partition_size=2
+    )
+    assert isinstance(table, cst.PartitionTable)
+    assert table == expected
+    assert hash(table) == hash(expected)
+    assert len(table) == 4
+    assert table[-1] == (2, 2, 6)
+    assert table[1:3] == expected[1:3]
+    assert table[::-1] == expected[::-1]
+    assert (2, 3, 5) in table
+    assert table.index((2, 3, 5)) == 2
+    with pytest.raises(IndexError):
+        table[4]
+
+
+@given(data=st.data())
+def test_partition_table_can_be_sampled_from(data: st.DataObject):
+    table = cst.restricted_partitions(num_items=10, num_partitions=3)
+    assert data.draw(st.sampled_from(table)) in table
+
+
+def test_partition_table_is_compact():
+    table = cst.restricted_partitions(num_items=40, num_partitions=8)
+    as_tuples = tuple(table)
+    tuple_nbytes = sys.getsizeof(as_tuples) + sum(map(sys.getsizeof, as_tuples))
+    assert table.nbytes * 10 < tuple_nbytes
+
+
+def test_partition_table_supports_large_part_sizes():
+    table = cst.PartitionTable([(1, 2**40)], num_parts=2, max_part_size=2**40)
+    assert table == ((1, 2**40),)